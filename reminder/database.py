@@ -4,8 +4,23 @@ from datetime import datetime
 
 import enum
 import discord
-from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Enum
-from typing import List, Dict
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    String,
+    bindparam,
+    func,
+    insert,
+    select,
+    text,
+)
+from typing import List, Dict, Optional
+
+from sqlalchemy.orm import load_only
 
 from pie.database import database, session
 
@@ -15,8 +30,12 @@ class ReminderStatus(enum.Enum):
     REMINDED: str = "REMINDED"
     FAILED: str = "FAILED"
 
+    @staticmethod
     def str_list() -> str:
-        return ", ".join([e.name for e in ReminderStatus])
+        return _STATUS_NAMES
+
+
+_STATUS_NAMES = ", ".join(e.name for e in ReminderStatus)
 
 
 class ReminderItem(database.base):
@@ -35,6 +54,28 @@ class ReminderItem(database.base):
     """
 
     __tablename__ = "reminder_reminder_reminderitem"
+    __table_args__ = (
+        Index("ix_rem_status_date", "status", "remind_date"),
+        Index(
+            "ix_rem_recipient_status_date",
+            "recipient_id",
+            "status",
+            "remind_date",
+        ),
+        Index(
+            "ix_rem_guild_status_date",
+            "guild_id",
+            "status",
+            "remind_date",
+        ),
+        # Partial index for the due-items poll; only WAITING rows are a
+        # tiny fraction of the table once history accumulates.
+        Index(
+            "ix_rem_waiting_date",
+            "remind_date",
+            postgresql_where=text("status = 'WAITING'"),
+        ),
+    )
 
     idx = Column(Integer, primary_key=True, autoincrement=True)
     guild_id = Column(BigInteger, default=None)
@@ -44,7 +85,28 @@ class ReminderItem(database.base):
     message = Column(String, default=None)
     origin_date = Column(DateTime(timezone=True), default=None)
     remind_date = Column(DateTime(timezone=True), default=None)
-    status = Column(Enum(ReminderStatus), default=ReminderStatus.WAITING)
+    status = Column(
+        Enum(
+            ReminderStatus,
+            native_enum=False,
+            length=16,
+            values_callable=lambda e: [member.value for member in e],
+        ),
+        default=ReminderStatus.WAITING,
+    )
+
+    # Attribute names used by __repr__ and dump, in output order.
+    _DUMP_KEYS = (
+        "idx",
+        "guild_id",
+        "author_id",
+        "recipient_id",
+        "permalink",
+        "message",
+        "origin_date",
+        "remind_date",
+        "status",
+    )
 
     @staticmethod
     def add(
@@ -90,6 +152,34 @@ class ReminderItem(database.base):
         session.commit()
         return item
 
+    @staticmethod
+    def add_many(items: List[Dict]) -> None:
+        """Creates multiple ReminderItems in a single transaction.
+
+        Unlike calling :meth:`add` in a loop, this issues one bulk
+        INSERT and one commit regardless of the number of items.
+
+        Args:
+            items: Column-value mappings, one per reminder.
+        """
+        if not items:
+            return
+
+        session.execute(insert(ReminderItem), items)
+        session.commit()
+
+    @staticmethod
+    def get(idx: int) -> Optional[ReminderItem]:
+        """Retreives a single ReminderItem by its database ID.
+
+        Args:
+            idx: ID of the reminder item.
+
+        Returns:
+            The reminder item, or None if it does not exist.
+        """
+        return session.get(ReminderItem, idx)
+
     @staticmethod
     def get_all(
         guild: discord.Guild = None,
@@ -100,6 +190,7 @@ class ReminderItem(database.base):
         max_origin_date: datetime = None,
         min_remind_date: datetime = None,
         max_remind_date: datetime = None,
+        limit: int = None,
     ) -> List[ReminderItem]:
         """Retreives List of ReminderItem filtered by Guild ID.
 
@@ -112,10 +203,85 @@ class ReminderItem(database.base):
             max_origin_date: Filter items created before this date.
             min_remind_date: Filter items being reminded after this date.
             max_remind_date: Filter items being reminded before this date.
+            limit: Return at most this many items.
 
         Returns:
             :class:`List[ReminderItem]`: The retrieved reminder items ordered by remind_date descending.
         """
+        query = ReminderItem._filtered_query(
+            guild=guild,
+            idx=idx,
+            recipient=recipient,
+            status=status,
+            min_origin_date=min_origin_date,
+            max_origin_date=max_origin_date,
+            min_remind_date=min_remind_date,
+            max_remind_date=max_remind_date,
+            limit=limit,
+        )
+
+        return query.all()
+
+    @staticmethod
+    def get_due() -> List[ReminderItem]:
+        """Retreives WAITING reminders that are due.
+
+        The cutoff is computed in Python because remind dates are
+        stored from the application clock; comparing them against the
+        database server's clock would shift fires by the UTC offset.
+        The reminder loop runs this query with the same shape on every
+        tick, so it uses a precompiled statement that SQLAlchemy can
+        serve from its compiled-SQL cache.
+
+        Returns:
+            :class:`List[ReminderItem]`: The due reminder items ordered by remind_date descending.
+        """
+        return session.scalars(
+            _DUE_STMT,
+            {
+                "status": ReminderStatus.WAITING,
+                "max_remind_date": datetime.now(),
+            },
+        ).all()
+
+    @staticmethod
+    def get_all_iter(**filters):
+        """Same filtering as :meth:`get_all`, but streams the rows
+        in batches of 500 instead of materializing the full result list.
+
+        Only the columns the reminder listing renders are fetched;
+        the wide text columns (permalink, origin_date) are deferred.
+
+        Returns:
+            Iterator over the matching reminder items.
+        """
+        query = ReminderItem._filtered_query(**filters).options(
+            load_only(
+                ReminderItem.idx,
+                ReminderItem.guild_id,
+                ReminderItem.author_id,
+                ReminderItem.recipient_id,
+                ReminderItem.remind_date,
+                ReminderItem.status,
+                ReminderItem.message,
+            )
+        )
+
+        return query.execution_options(stream_results=True).yield_per(500)
+
+    @staticmethod
+    def _filtered_query(
+        guild: discord.Guild = None,
+        idx: int = None,
+        recipient: discord.Member = None,
+        status: ReminderStatus = None,
+        min_origin_date: datetime = None,
+        max_origin_date: datetime = None,
+        min_remind_date: datetime = None,
+        max_remind_date: datetime = None,
+        limit: int = None,
+        ascending: bool = False,
+    ):
         query = session.query(ReminderItem)
 
         if guild is not None:
@@ -142,9 +308,44 @@ class ReminderItem(database.base):
         if max_remind_date is not None:
             query = query.filter(ReminderItem.remind_date < max_remind_date)
 
-        query = query.order_by(ReminderItem.remind_date.desc())
+        if ascending:
+            query = query.order_by(ReminderItem.remind_date.asc())
+        else:
+            query = query.order_by(ReminderItem.remind_date.desc())
 
-        return query.all()
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query
+
+    @classmethod
+    def batch_update_status(cls, idxs: List[int], status: ReminderStatus) -> None:
+        """Set status of multiple reminders in a single transaction.
+
+        Args:
+            idxs: Database IDs of the reminders to update.
+            status: The new status.
+        """
+        if not idxs:
+            return
+
+        session.query(cls).filter(cls.idx.in_(idxs)).update(
+            {cls.status: status}, synchronize_session="fetch"
+        )
+        session.commit()
+
+    @staticmethod
+    def get_next_remind_date() -> Optional[datetime]:
+        """Get the earliest remind date among waiting reminders.
+
+        Returns:
+            The next remind date, or None if no reminder is waiting.
+        """
+        return (
+            session.query(func.min(ReminderItem.remind_date))
+            .filter_by(status=ReminderStatus.WAITING)
+            .scalar()
+        )
 
     def delete(self):
         """
@@ -169,13 +370,10 @@ class ReminderItem(database.base):
         return count
 
     def __repr__(self) -> str:
-        return (
-            f'<ReminderItem idx="{self.idx}" guild_id="{self.guild_id}" '
-            f'author_id="{self.author_id}" recipient_id="{self.recipient_id}" '
-            f'permalink="{self.permalink}" message="{self.message}" '
-            f'origin_date="{self.origin_date}" remind_date="{self.remind_date}" '
-            f'status="{self.status}">'
+        attributes = " ".join(
+            f'{key}="{getattr(self, key)}"' for key in self._DUMP_KEYS
         )
+        return f"<ReminderItem {attributes}>"
 
     def dump(self) -> Dict:
         """Dumps ReminderItem into a dictionary.
@@ -183,18 +381,20 @@ class ReminderItem(database.base):
         Returns:
             :class:`Dict`: The ReminderItem as a dictionary.
         """
-        return {
-            "idx": self.idx,
-            "guild_id": self.guild_id,
-            "author_id": self.author_id,
-            "recipient_id": self.recipient_id,
-            "permalink": self.permalink,
-            "message": self.message,
-            "origin_date": self.origin_date,
-            "remind_date": self.remind_date,
-            "status": self.status,
-        }
+        return {key: getattr(self, key) for key in self._DUMP_KEYS}
 
     def save(self):
         """Commits the ReminderItem to the database."""
         session.commit()
+
+
+# Statement for ReminderItem.get_due, built once so repeated executions
+# hit SQLAlchemy's compiled-SQL cache.
+_DUE_STMT = (
+    select(ReminderItem)
+    .where(
+        ReminderItem.status == bindparam("status"),
+        ReminderItem.remind_date <= bindparam("max_remind_date"),
+    )
+    .order_by(ReminderItem.remind_date.desc())
+)
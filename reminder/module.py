@@ -1,8 +1,10 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.errors import HTTPException, Forbidden
 
 import dateutil.parser
@@ -16,87 +18,162 @@ _ = i18n.Translator("modules/reminder").translate
 bot_log = logger.Bot.logger()
 guild_log = logger.Guild.logger()
 
+# Longest time the reminder loop sleeps before re-checking the database,
+# even when no reminder is scheduled.
+MAX_SLEEP_SECONDS: int = 300
+
+# How long the reminder loop waits before retrying after an unexpected
+# error (e.g. a transient database failure).
+ERROR_SLEEP_SECONDS: int = 30
+
+# Most reminders a single listing fetches from the database.
+LIST_LIMIT: int = 500
+
+# How long fetched users are kept in the member cache, and how many
+# entries the cache may hold before it is flushed.
+MEMBER_CACHE_TTL: int = 600
+MEMBER_CACHE_SIZE: int = 4096
+
 
 class Reminder(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reminder.start()
+        self._wake = asyncio.Event()
+        self._member_cache: dict = {}
+        self._reminder_task = asyncio.create_task(self.reminder())
 
     def cog_unload(self):
-        self.reminder.cancel()
+        self._reminder_task.cancel()
 
     # LOOPS
 
-    @tasks.loop(seconds=30)
     async def reminder(self):
-        max_remind_time = datetime.now() + timedelta(seconds=30)
+        await self.bot.wait_until_ready()
 
-        items = ReminderItem.get_all(
-            status=ReminderStatus.WAITING, max_remind_date=max_remind_time
-        )
+        while True:
+            try:
+                await self._reminder_tick()
+                await self._sleep_until_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                await bot_log.error(
+                    None,
+                    None,
+                    f"Reminder loop iteration failed: {exc!r}.",
+                )
+                await asyncio.sleep(ERROR_SLEEP_SECONDS)
 
-        if items is not None:
-            for item in items:
-                await self._remind(item)
+    async def _reminder_tick(self):
+        items = ReminderItem.get_due()
 
-    @reminder.before_loop
-    async def before_reminder(self):
-        await self.bot.wait_until_ready()
+        if items:
+            results = await asyncio.gather(
+                *(self._remind(item) for item in items),
+                return_exceptions=True,
+            )
+
+            statuses = []
+            for item, result in zip(items, results):
+                if isinstance(result, Exception):
+                    await bot_log.error(
+                        item.recipient_id,
+                        item.guild_id,
+                        f"Unable to remind user: {result!r}.",
+                    )
+                    result = ReminderStatus.FAILED
+                statuses.append(result)
+
+            for status in (ReminderStatus.REMINDED, ReminderStatus.FAILED):
+                ReminderItem.batch_update_status(
+                    [
+                        item.idx
+                        for item, item_status in zip(items, statuses)
+                        if item_status is status
+                    ],
+                    status,
+                )
+
+    async def _sleep_until_due(self):
+        """Sleep until the next reminder is due.
+
+        The sleep is capped at MAX_SLEEP_SECONDS and interrupted
+        when a new reminder is added.
+        """
+        next_date = ReminderItem.get_next_remind_date()
+
+        if next_date is None:
+            timeout = MAX_SLEEP_SECONDS
+        else:
+            # remind_date is a timezone-aware column, so the database may
+            # return an aware datetime; naive datetime.now() cannot be
+            # subtracted from it.
+            now = datetime.now(next_date.tzinfo)
+            timeout = (next_date - now).total_seconds()
+            timeout = min(max(timeout, 1), MAX_SLEEP_SECONDS)
+
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
     # HELPER FUNCTIONS
 
-    async def _remind(self, item: ReminderItem):
+    async def _remind(self, item: ReminderItem) -> ReminderStatus:
+        """Send the reminder to its recipient.
+
+        Returns:
+            The resulting status; the caller is responsible for saving it.
+        """
         reminded_user = await self._get_member(item.recipient_id, item.guild_id)
 
         if reminded_user is None:
-            item.status = ReminderStatus.FAILED
-            item.save()
             await bot_log.warning(
                 item.recipient_id,
                 item.guild_id,
                 "Unable to remind user - member out of bot's reach.",
             )
-            return
+            return ReminderStatus.FAILED
 
-        utx = i18n.TranslationContext(item.guild_id, item.recipient_id)
+        tc = i18n.TranslationContext(item.guild_id, item.recipient_id)
 
-        embed = await self._get_embed(utx, item)
+        reminder_user = reminded_user if item.author_id == item.recipient_id else None
+        embed = await self._get_embed(tc, item, reminder_user=reminder_user)
 
         try:
             message = await reminded_user.send(embed=embed)
         except (HTTPException, Forbidden):
-            item.status = ReminderStatus.FAILED
-            item.save()
             await bot_log.warning(
                 item.recipient_id,
                 item.guild_id,
                 "Unable to remind user - blocked PM or not enough permissions.",
             )
-            return
-
-        item.status = ReminderStatus.REMINDED
-        item.save()
-
-        await bot_log.debug(
-            reminded_user,
-            message.channel.id,
-            "Reminder ID {id} succesfully sent to {user}".format(
-                id=item.idx, user=reminded_user.display_name
-            ),
-        )
+            return ReminderStatus.FAILED
+        else:
+            await bot_log.debug(
+                reminded_user,
+                message.channel.id,
+                "Reminder ID {id} succesfully sent to {user}".format(
+                    id=item.idx, user=reminded_user.display_name
+                ),
+            )
+            return ReminderStatus.REMINDED
 
     async def _process_text(self, ctx: commands.Context, text: Optional[str]):
+        """Shortens text to 1024 characters. Places end of the code block at the end if the truncated text contains unclosed block."""
         if text is not None and len(text) > 1024:
             text = text[:1024]
             text = text[:-3] + "```" if text.count("```") % 2 != 0 else text
 
         return text
 
-    async def _get_embed(self, utx, query):
-        reminder_user = await self._get_member(query.author_id, query.guild_id)
+    async def _get_embed(self, tc, query, reminder_user=None):
+        if reminder_user is None:
+            reminder_user = await self._get_member(query.author_id, query.guild_id)
 
         if reminder_user is None:
-            reminder_user_name = "_({unknown})_".format(unknown=_(utx, "Unknown user"))
+            reminder_user_name = "_({unknown})_".format(unknown=_(tc, "Unknown user"))
         else:
             reminder_user_name = discord.utils.escape_markdown(
                 reminder_user.display_name
@@ -104,43 +181,34 @@ class Reminder(commands.Cog):
 
         embed = utils.discord.create_embed(
             author=reminder_user,
-            title=_(utx, "Reminder"),
+            title=_(tc, "Reminder"),
         )
 
         if query.author_id != query.recipient_id:
             embed.add_field(
-                name=_(utx, "Reminded by"),
+                name=_(tc, "Reminded by"),
                 value=reminder_user_name,
                 inline=True,
             )
-        if query.message != "":
+        if query.message:
             embed.add_field(
-                name=_(utx, "Message"),
+                name=_(tc, "Message"),
                 value=query.message,
                 inline=False,
             )
-        embed.add_field(name=_(utx, "URL"), value=query.permalink, inline=True)
+        embed.add_field(name=_(tc, "URL"), value=query.permalink, inline=True)
 
         return embed
 
     async def _send_reminder_list(self, ctx, query, *, include_reminded: bool = True):
         reminders = []
+        member_keys = set()
 
         for item in query:
-            author = await self._get_member(item.author_id, item.guild_id)
-            remind = await self._get_member(item.recipient_id, item.guild_id)
-
-            author_name = (
-                author.display_name if author is not None else _(ctx, "(unknown)")
-            )
-            remind_name = (
-                remind.display_name if remind is not None else _(ctx, "(unknown)")
-            )
-
             reminder = ReminderDummy()
             reminder.idx = item.idx
-            reminder.author_name = author_name
-            reminder.remind_name = remind_name
+            reminder.author_key = (item.author_id, item.guild_id)
+            reminder.remind_key = (item.recipient_id, item.guild_id)
             reminder.remind_date = item.remind_date.strftime("%Y-%m-%d %H:%M")
             reminder.status = item.status.name
             reminder.message = item.message
@@ -148,8 +216,24 @@ class Reminder(commands.Cog):
             if reminder.message and len(reminder.message) > 30:
                 reminder.message = reminder.message[:29] + "\N{HORIZONTAL ELLIPSIS}"
 
+            member_keys.add(reminder.author_key)
+            member_keys.add(reminder.remind_key)
             reminders.append(reminder)
 
+        members = await self._get_members(member_keys)
+        unknown = _(ctx, "(unknown)")
+
+        for reminder in reminders:
+            author = members.get(reminder.author_key)
+            remind = members.get(reminder.remind_key)
+
+            reminder.author_name = (
+                author.display_name if author is not None else unknown
+            )
+            reminder.remind_name = (
+                remind.display_name if remind is not None else unknown
+            )
+
         table_columns: dict = {
             "idx": _(ctx, "ID"),
             "author_name": _(ctx, "Author"),
@@ -161,23 +245,67 @@ class Reminder(commands.Cog):
         if not include_reminded:
             del table_columns["remind_name"]
 
-        table_pages: List[str] = utils.text.create_table(reminders[::-1], table_columns)
+        table_pages: List[str] = utils.text.create_table(reminders, table_columns)
 
         for table_page in table_pages:
             await ctx.send("```" + table_page.replace("`", "'") + "```")
 
+        if len(reminders) == LIST_LIMIT:
+            await ctx.send(
+                _(ctx, "Showing only the first {limit} reminders.").format(
+                    limit=LIST_LIMIT
+                )
+            )
+
+    async def _confirm(self, ctx, embed, *, title: str) -> Optional[bool]:
+        """Ask the user to confirm an action over the given embed.
+
+        Returns:
+            True on confirmation, False on abort, None on timeout.
+        """
+        embed.title = title
+        view = ConfirmView(ctx, embed)
+        return await view.send()
+
+    async def _get_members(self, keys) -> dict:
+        """Resolve multiple members concurrently.
+
+        Args:
+            keys: Iterable of (user_id, guild_id) tuples.
+
+        Returns:
+            Mapping of (user_id, guild_id) to the resolved member (or None).
+        """
+        keys = list(keys)
+        members = await asyncio.gather(
+            *(self._get_member(user_id, guild_id) for user_id, guild_id in keys)
+        )
+        return dict(zip(keys, members))
+
     async def _get_member(self, user_id: int, guild_id: int = 0):
         user = None
 
         if guild_id > 0:
             guild = self.bot.get_guild(guild_id)
-            user = guild.get_member(user_id)
+            if guild is not None:
+                user = guild.get_member(user_id)
 
         if user is None:
+            cached = self._member_cache.get(user_id)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1]
+
             try:
                 user = await self.bot.fetch_user(user_id)
             except discord.errors.NotFound:
                 pass
+            else:
+                if len(self._member_cache) >= MEMBER_CACHE_SIZE:
+                    self._member_cache.clear()
+                self._member_cache[user_id] = (
+                    time.monotonic() + MEMBER_CACHE_TTL,
+                    user,
+                )
 
         return user
 
@@ -226,6 +354,7 @@ class Reminder(commands.Cog):
             origin_date=ctx.message.created_at,
             remind_date=date,
         )
+        self._wake.set()
 
         date = utils.time.format_datetime(date)
 
@@ -287,6 +416,7 @@ class Reminder(commands.Cog):
             origin_date=ctx.message.created_at,
             remind_date=date,
         )
+        self._wake.set()
 
         date = utils.time.format_datetime(date)
 
@@ -333,7 +463,9 @@ class Reminder(commands.Cog):
             )
             return
 
-        query = ReminderItem.get_all(recipient=ctx.author, status=status)
+        query = ReminderItem.get_all_iter(
+            recipient=ctx.author, status=status, limit=LIST_LIMIT, ascending=True
+        )
         await self._send_reminder_list(ctx, query, include_reminded=False)
 
     @check.acl2(check.ACLevel.EVERYONE)
@@ -404,7 +536,9 @@ class Reminder(commands.Cog):
             )
             return
 
-        query = ReminderItem.get_all(guild=ctx.guild, status=status)
+        query = ReminderItem.get_all_iter(
+            guild=ctx.guild, status=status, limit=LIST_LIMIT, ascending=True
+        )
         await self._send_reminder_list(ctx, query)
 
     @check.acl2(check.ACLevel.EVERYONE)
@@ -416,15 +550,13 @@ class Reminder(commands.Cog):
             idx: ID of reminder.
             datetime_str: Datetime string (preferably quoted).
         """
-        query = ReminderItem.get_all(idx=idx)
+        query = ReminderItem.get(idx)
         if query is None:
             await ctx.send(
                 _(ctx, "Reminder with ID {id} does not exist.").format(id=idx)
             )
             return
 
-        query = query[0]
-
         if query.recipient_id != ctx.author.id:
             await ctx.send(_(ctx, "Can't reschedule other's reminders."))
             return
@@ -457,16 +589,16 @@ class Reminder(commands.Cog):
             value=print_date,
             inline=False,
         )
-        embed.title = _(ctx, "Do you want to reschedule this reminder?")
-        view = ConfirmView(ctx, embed)
-
-        value = await view.send()
+        value = await self._confirm(
+            ctx, embed, title=_(ctx, "Do you want to reschedule this reminder?")
+        )
         if value is None:
             await ctx.send(_(ctx, "Reschedule timed out."))
         elif value:
             query.remind_date = date
             query.status = ReminderStatus.WAITING
             query.save()
+            self._wake.set()
             await ctx.send(_(ctx, "Reminder rescheduled."))
             await guild_log.debug(
                 ctx.author,
@@ -484,24 +616,21 @@ class Reminder(commands.Cog):
         Args:
             idx: ID of reminder.
         """
-        query = ReminderItem.get_all(idx=idx)
-        if not query:
+        query = ReminderItem.get(idx)
+        if query is None:
             await ctx.send(
                 _(ctx, "Reminder with ID {id} does not exist.").format(id=idx)
             )
             return
 
-        query = query[0]
-
         if query.recipient_id != ctx.author.id:
             await ctx.send(_(ctx, "Can't delete other's reminders."))
             return
 
         embed = await self._get_embed(ctx, query)
-        embed.title = _(ctx, "Do you want to delete this reminder?")
-        view = ConfirmView(ctx, embed)
-
-        value = await view.send()
+        value = await self._confirm(
+            ctx, embed, title=_(ctx, "Do you want to delete this reminder?")
+        )
         if value is None:
             await ctx.send(_(ctx, "Deleting timed out."))
         elif value: